@@ -7,16 +7,18 @@
 
 """Jalali (Persian) calendar utilities."""
 
-from datetime import date, datetime
+from datetime import UTC, date, datetime
+from functools import lru_cache
+from string import digits
 
 import jdatetime
-import pytz
 from babel.dates import get_timezone
 
+from indico.util.caching import memoize_request
 from indico.util.i18n import get_current_locale
 
 
-PERSIAN_MONTHS = [
+PERSIAN_MONTHS = (
     'فروردین',
     'اردیبهشت',
     'خرداد',
@@ -29,9 +31,10 @@ PERSIAN_MONTHS = [
     'دی',
     'بهمن',
     'اسفند',
-]
+)
 
-PERSIAN_WEEKDAYS = [
+# Indexed directly by `jdatetime.date.weekday()`, which counts from Saturday.
+PERSIAN_WEEKDAYS = (
     'شنبه',      # Saturday
     'یکشنبه',    # Sunday
     'دوشنبه',    # Monday
@@ -39,27 +42,98 @@ PERSIAN_WEEKDAYS = [
     'چهارشنبه',  # Wednesday
     'پنج‌شنبه',  # Thursday
     'جمعه',      # Friday
-]
+)
 
-PERSIAN_WEEKDAYS_SHORT = ['ش', 'ی', 'د', 'س', 'چ', 'پ', 'ج']
+PERSIAN_WEEKDAYS_SHORT = ('ش', 'ی', 'د', 'س', 'چ', 'پ', 'ج')
 
-PERSIAN_DIGITS = ['۰', '۱', '۲', '۳', '۴', '۵', '۶', '۷', '۸', '۹']
+PERSIAN_DIGITS = ('۰', '۱', '۲', '۳', '۴', '۵', '۶', '۷', '۸', '۹')
 
+ARABIC_DIGITS = ('٠', '١', '٢', '٣', '٤', '٥', '٦', '٧', '٨', '٩')
 
+# Translation table mapping Persian and Arabic-Indic digits to ASCII digits;
+# built once so `normalize_persian_digits` is a single `str.translate` pass.
+_NORMALIZE_DIGIT_TRANS = str.maketrans(
+    dict(zip(PERSIAN_DIGITS, digits, strict=True)) | dict(zip(ARABIC_DIGITS, digits, strict=True))
+)
+
+# The reverse table, mapping ASCII digits to Persian ones for `to_persian_digits`.
+_PERSIAN_DIGIT_TRANS = str.maketrans(dict(zip(digits, PERSIAN_DIGITS, strict=True)))
+
+# Bindings resolved once at import time so the conversion hot path avoids
+# repeated attribute lookups.  jdatetime compares its locale against this
+# exact constant, so sharing it avoids scattering 'fa_IR' literals around.
+_FA_LOCALE = jdatetime.FA_LOCALE
+_UTC = UTC
+_jdatetime_fromgregorian = jdatetime.datetime.fromgregorian
+_jdate_fromgregorian = jdatetime.date.fromgregorian
+
+
+@memoize_request
 def should_use_jalali():
     """Check if Jalali calendar should be used based on current locale.
 
+    The result only depends on the session locale, so it is memoized for
+    the duration of the request to avoid repeating the locale lookup for
+    every formatted date on a page.
+
     Returns:
         bool: True if current locale is Persian (fa/fa_IR), False otherwise.
     """
     try:
-        locale = get_current_locale()
-        locale_str = str(locale)
-        return locale_str in ('fa', 'fa_IR') or locale_str.startswith('fa_')
+        # Checking the language attribute avoids building the full locale
+        # string just to match its `fa`/`fa_XX` prefix.
+        return getattr(get_current_locale(), 'language', None) == 'fa'
     except (AttributeError, RuntimeError):
         return False
 
 
+@lru_cache(maxsize=128)
+def _get_timezone(name):
+    # An instance only ever deals with a handful of timezones, so avoid
+    # re-parsing the tz name on every formatted datetime.
+    return get_timezone(name)
+
+
+@lru_cache(maxsize=4096)
+def _date_to_jalaali(year, month, day):
+    # The same event dates show up many times across a page (listings,
+    # sidebars, exports), so the calendar conversion is worth caching.
+    # jdatetime.date is immutable, so sharing instances is safe.
+    return _jdate_fromgregorian(date=date(year, month, day), locale=_FA_LOCALE)
+
+
+# Cumulative day count at the start of each Gregorian month (non-leap years).
+_GREGORIAN_MONTH_DAYS = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+
+@lru_cache(maxsize=4096)
+def _greg_to_jalali_ymd(gy, gm, gd):
+    # Convert a Gregorian date to a `(year, month, day)` tuple in the
+    # Jalali calendar using pure integer arithmetic (the widely used
+    # jalaali.js algorithm).  Much cheaper than building a jdatetime
+    # instance when only the numbers are needed.
+    gy2 = gy + 1 if gm > 2 else gy
+    days = (355666 + 365 * gy + (gy2 + 3) // 4 - (gy2 + 99) // 100 + (gy2 + 399) // 400
+            + gd + _GREGORIAN_MONTH_DAYS[gm - 1])
+    jy = -1595 + 33 * (days // 12053)
+    days %= 12053
+    jy += 4 * (days // 1461)
+    days %= 1461
+    if days > 365:
+        jy += (days - 1) // 365
+        days = (days - 1) % 365
+    if days < 186:
+        return jy, 1 + days // 31, 1 + days % 31
+    return jy, 7 + (days - 186) // 30, 1 + (days - 186) % 30
+
+
+def _to_jalaali_no_tz_convert(dt):
+    # Fast path for callers that have already moved `dt` to the timezone
+    # they want displayed; `to_jalaali` would convert it back to UTC and
+    # throw that wall-clock time away.
+    return _jdatetime_fromgregorian(datetime=dt, locale=_FA_LOCALE)
+
+
 def to_jalaali(dt):
     """Convert Gregorian datetime/date to Jalali.
 
@@ -72,20 +146,16 @@ def to_jalaali(dt):
     if dt is None:
         return None
 
-    if isinstance(dt, datetime):
+    # Exact type checks short-circuit the common case with a pointer
+    # comparison; isinstance only runs for subclasses.
+    tp = type(dt)
+    if tp is datetime or isinstance(dt, datetime):
         if dt.tzinfo:
             # Convert to UTC first, then to jdatetime
-            utc_dt = dt.astimezone(pytz.UTC)
-            return jdatetime.datetime.fromgregorian(
-                datetime=utc_dt,
-                locale='fa_IR'
-            )
-        return jdatetime.datetime.fromgregorian(
-            datetime=dt,
-            locale='fa_IR'
-        )
-    elif isinstance(dt, date):
-        return jdatetime.date.fromgregorian(date=dt, locale='fa_IR')
+            dt = dt.astimezone(_UTC)
+        return _jdatetime_fromgregorian(datetime=dt, locale=_FA_LOCALE)
+    elif tp is date or isinstance(dt, date):
+        return _date_to_jalaali(dt.year, dt.month, dt.day)
 
     return None
 
@@ -110,6 +180,61 @@ def from_jalaali(jdt):
     return None
 
 
+# Per-month templates for the long/full formats: the month name is baked
+# in once at import time, so at call time only the numbers (and weekday
+# name) get interpolated with a pre-parsed %-spec, which beats building
+# the whole string from scratch in an f-string.
+_LONG_DATE_TEMPLATES = tuple(f'%d {m} %d' for m in PERSIAN_MONTHS)
+_FULL_DATE_TEMPLATES = tuple(f'%s، %d {m} %d' for m in PERSIAN_MONTHS)
+_LONG_DATETIME_TEMPLATES = tuple(f'%d {m} %d، %02d:%02d' for m in PERSIAN_MONTHS)
+_FULL_DATETIME_TEMPLATES = tuple(f'%s، %d {m} %d، %02d:%02d:%02d' for m in PERSIAN_MONTHS)
+
+
+# These helpers take the original (tz-adjusted) Gregorian value and
+# convert via `_greg_to_jalali_ymd`, keeping jdatetime off the hot path.
+# The `_templates`/`_weekdays` default arguments bind the tuples at
+# function definition time, turning the global lookups in these per-call
+# helpers into local variable accesses.
+def _format_long_date(dt, _templates=_LONG_DATE_TEMPLATES):
+    jy, jm, jd = _greg_to_jalali_ymd(dt.year, dt.month, dt.day)
+    return _templates[jm - 1] % (jd, jy)
+
+
+def _format_full_date(dt, _templates=_FULL_DATE_TEMPLATES, _weekdays=PERSIAN_WEEKDAYS):
+    jy, jm, jd = _greg_to_jalali_ymd(dt.year, dt.month, dt.day)
+    # Python weekdays count from Monday, the Persian ones from Saturday
+    return _templates[jm - 1] % (_weekdays[(dt.weekday() + 2) % 7], jd, jy)
+
+
+def _format_long_datetime(dt, _templates=_LONG_DATETIME_TEMPLATES):
+    jy, jm, jd = _greg_to_jalali_ymd(dt.year, dt.month, dt.day)
+    return _templates[jm - 1] % (jd, jy, dt.hour, dt.minute)
+
+
+def _format_full_datetime(dt, _templates=_FULL_DATETIME_TEMPLATES, _weekdays=PERSIAN_WEEKDAYS):
+    jy, jm, jd = _greg_to_jalali_ymd(dt.year, dt.month, dt.day)
+    return _templates[jm - 1] % (_weekdays[(dt.weekday() + 2) % 7], jd, jy, dt.hour, dt.minute, dt.second)
+
+
+# Dispatch tables for the predefined formats: plain strings are strftime
+# patterns, callables build the string from Persian month/weekday names.
+_DATE_FORMATS = {
+    'short': '%y/%m/%d',
+    'medium': '%Y/%m/%d',
+    'code': '%d/%m/%Y',
+    'long': _format_long_date,
+    'full': _format_full_date,
+}
+
+_DATETIME_FORMATS = {
+    'short': '%y/%m/%d %H:%M',
+    'medium': '%Y/%m/%d %H:%M',
+    'code': '%d/%m/%Y %H:%M',
+    'long': _format_long_datetime,
+    'full': _format_full_datetime,
+}
+
+
 def format_jalaali_date(dt, format='medium', locale=None):
     """Format a date in Jalali calendar.
 
@@ -121,34 +246,42 @@ def format_jalaali_date(dt, format='medium', locale=None):
     Returns:
         str: Formatted Jalali date string.
     """
-    if dt is None:
+    if not dt:
         return ''
 
+    entry = _DATE_FORMATS.get(format, format)
+    if not isinstance(entry, str):
+        # The long/full formatters convert via integer arithmetic and do
+        # not need a jdatetime instance; like `to_jalaali`, normalize
+        # tz-aware datetimes to UTC first.
+        if getattr(dt, 'tzinfo', None):
+            dt = dt.astimezone(_UTC)
+        return entry(dt)
+
     jdt = to_jalaali(dt)
     if jdt is None:
         return ''
+    return jdt.strftime(entry)
+
+
+def format_jalaali_dates(dates, format='medium', locale=None):
+    """Format an iterable of dates in Jalali calendar.
+
+    Resolves the format dispatch once up front, so rendering a whole
+    column of dates only pays the per-item conversion cost.
+
+    Args:
+        dates: An iterable of datetime/date objects (items may be None).
+        format: Format string ('short', 'medium', 'long', or custom format).
+        locale: Locale string (not used, kept for compatibility).
 
-    # Predefined formats
-    if format == 'short':
-        return jdt.strftime('%y/%m/%d', locale='fa_IR')
-    elif format == 'medium':
-        return jdt.strftime('%Y/%m/%d', locale='fa_IR')
-    elif format == 'long':
-        day = jdt.day
-        month = PERSIAN_MONTHS[jdt.month - 1]
-        year = jdt.year
-        return f'{day} {month} {year}'
-    elif format == 'full':
-        weekday = PERSIAN_WEEKDAYS[jdt.weekday()]
-        day = jdt.day
-        month = PERSIAN_MONTHS[jdt.month - 1]
-        year = jdt.year
-        return f'{weekday}، {day} {month} {year}'
-    elif format == 'code':
-        return jdt.strftime('%d/%m/%Y', locale='fa_IR')
-    else:
-        # Custom format
-        return jdt.strftime(format, locale='fa_IR')
+    Returns:
+        list: Formatted Jalali date strings ('' for missing items).
+    """
+    entry = _DATE_FORMATS.get(format, format)
+    if isinstance(entry, str):
+        return [to_jalaali(d).strftime(entry) if d else '' for d in dates]
+    return [entry(d.astimezone(_UTC) if getattr(d, 'tzinfo', None) else d) if d else '' for d in dates]
 
 
 def format_jalaali_datetime(dt, format='medium', locale=None, timezone=None):
@@ -163,42 +296,32 @@ def format_jalaali_datetime(dt, format='medium', locale=None, timezone=None):
     Returns:
         str: Formatted Jalali datetime string.
     """
-    if dt is None:
+    if not dt:
         return ''
 
-    # Apply timezone conversion if needed
-    if timezone and dt.tzinfo:
-        if isinstance(timezone, str):
-            timezone = get_timezone(timezone)
-        dt = dt.astimezone(timezone)
-
-    jdt = to_jalaali(dt)
+    # Convert tz-aware datetimes to the requested timezone (UTC if none
+    # was given, matching `to_jalaali`)
+    tzinfo = getattr(dt, 'tzinfo', None)
+    if tzinfo:
+        if timezone:
+            if isinstance(timezone, str):
+                timezone = _get_timezone(timezone)
+            dt = dt.astimezone(timezone)
+        else:
+            dt = dt.astimezone(_UTC)
+
+    entry = _DATETIME_FORMATS.get(format, format)
+    if not isinstance(entry, str):
+        # The long/full formatters convert via integer arithmetic and do
+        # not need a jdatetime instance
+        return entry(dt)
+
+    # `dt` is already in the right timezone, so skip the conversion in
+    # `to_jalaali` which would turn this back into UTC wall-clock time.
+    jdt = _to_jalaali_no_tz_convert(dt) if tzinfo else to_jalaali(dt)
     if jdt is None:
         return ''
-
-    # Predefined formats
-    if format == 'short':
-        return jdt.strftime('%y/%m/%d %H:%M', locale='fa_IR')
-    elif format == 'medium':
-        return jdt.strftime('%Y/%m/%d %H:%M', locale='fa_IR')
-    elif format == 'long':
-        day = jdt.day
-        month = PERSIAN_MONTHS[jdt.month - 1]
-        year = jdt.year
-        time_str = jdt.strftime('%H:%M', locale='fa_IR')
-        return f'{day} {month} {year}، {time_str}'
-    elif format == 'full':
-        weekday = PERSIAN_WEEKDAYS[jdt.weekday()]
-        day = jdt.day
-        month = PERSIAN_MONTHS[jdt.month - 1]
-        year = jdt.year
-        time_str = jdt.strftime('%H:%M:%S', locale='fa_IR')
-        return f'{weekday}، {day} {month} {year}، {time_str}'
-    elif format == 'code':
-        return jdt.strftime('%d/%m/%Y %H:%M', locale='fa_IR')
-    else:
-        # Custom format
-        return jdt.strftime(format, locale='fa_IR')
+    return jdt.strftime(entry)
 
 
 def parse_jalaali_date(date_str, format='%Y/%m/%d'):
@@ -217,8 +340,17 @@ def parse_jalaali_date(date_str, format='%Y/%m/%d'):
     # Normalize digits first
     date_str = normalize_persian_digits(date_str)
 
+    if format == '%Y/%m/%d':
+        # Fast path for the default format: three int conversions instead
+        # of jdatetime's strptime machinery
+        try:
+            year, month, day = map(int, date_str.split('/', 2))
+            return jdatetime.date(year, month, day).togregorian()
+        except ValueError:
+            return None
+
     try:
-        jdt = jdatetime.datetime.strptime(date_str, format, locale='fa_IR')
+        jdt = jdatetime.datetime.strptime(date_str, format)
         return jdt.togregorian().date()
     except (ValueError, AttributeError):
         return None
@@ -240,8 +372,18 @@ def parse_jalaali_datetime(datetime_str, format='%Y/%m/%d %H:%M'):
     # Normalize digits first
     datetime_str = normalize_persian_digits(datetime_str)
 
+    if format == '%Y/%m/%d %H:%M':
+        # Fast path for the default format, mirroring parse_jalaali_date
+        try:
+            date_part, time_part = datetime_str.split(' ', 1)
+            year, month, day = map(int, date_part.split('/', 2))
+            hour, minute = map(int, time_part.split(':', 1))
+            return jdatetime.datetime(year, month, day, hour, minute).togregorian()
+        except ValueError:
+            return None
+
     try:
-        jdt = jdatetime.datetime.strptime(datetime_str, format, locale='fa_IR')
+        jdt = jdatetime.datetime.strptime(datetime_str, format)
         return jdt.togregorian()
     except (ValueError, AttributeError):
         return None
@@ -259,17 +401,7 @@ def normalize_persian_digits(text):
     if not text:
         return text
 
-    # Persian digits
-    persian_digits = ['۰', '۱', '۲', '۳', '۴', '۵', '۶', '۷', '۸', '۹']
-    # Arabic-Indic digits
-    arabic_digits = ['٠', '١', '٢', '٣', '٤', '٥', '٦', '٧', '٨', '٩']
-
-    result = text
-    for i in range(10):
-        result = result.replace(persian_digits[i], str(i))
-        result = result.replace(arabic_digits[i], str(i))
-
-    return result
+    return text.translate(_NORMALIZE_DIGIT_TRANS)
 
 
 def to_persian_digits(text):
@@ -284,32 +416,28 @@ def to_persian_digits(text):
     if not text:
         return text
 
-    result = str(text)
-    for i in range(10):
-        result = result.replace(str(i), PERSIAN_DIGITS[i])
-
-    return result
+    return str(text).translate(_PERSIAN_DIGIT_TRANS)
 
 
 def get_jalaali_month_names():
-    """Get list of Jalali month names in Persian.
+    """Get Jalali month names in Persian.
 
     Returns:
-        list: List of 12 month names.
+        tuple: The 12 month names.
     """
-    return PERSIAN_MONTHS.copy()
+    return PERSIAN_MONTHS
 
 
 def get_jalaali_weekday_names(short=False):
-    """Get list of weekday names in Persian.
+    """Get weekday names in Persian.
 
     Args:
         short: If True, return abbreviated weekday names.
 
     Returns:
-        list: List of 7 weekday names.
+        tuple: The 7 weekday names.
     """
-    return PERSIAN_WEEKDAYS_SHORT.copy() if short else PERSIAN_WEEKDAYS.copy()
+    return PERSIAN_WEEKDAYS_SHORT if short else PERSIAN_WEEKDAYS
 
 
 def jalaali_now():
@@ -318,13 +446,18 @@ def jalaali_now():
     Returns:
         jdatetime.datetime: Current Jalali datetime.
     """
-    return jdatetime.datetime.now(locale='fa_IR')
+    return _jdatetime_fromgregorian(datetime=datetime.now(), locale=_FA_LOCALE)
 
 
+@memoize_request
 def jalaali_today():
     """Get current date in Jalali calendar.
 
+    The result cannot change within a request, so it is memoized to
+    avoid redundant conversions when templates use it repeatedly.
+
     Returns:
         jdatetime.date: Current Jalali date.
     """
-    return jdatetime.date.today(locale='fa_IR')
+    today = date.today()
+    return _date_to_jalaali(today.year, today.month, today.day)
@@ -0,0 +1,125 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from datetime import date, datetime, timedelta
+from string import digits
+
+import pytest
+import pytz
+
+from indico.util.jalaali import (PERSIAN_WEEKDAYS, format_jalaali_date, format_jalaali_dates,
+                                 format_jalaali_datetime, normalize_persian_digits, parse_jalaali_date,
+                                 parse_jalaali_datetime, to_jalaali, to_persian_digits)
+
+
+@pytest.mark.parametrize(('text', 'expected'), (
+    ('', ''),
+    (None, None),
+    ('1404/01/15', '1404/01/15'),
+    ('۱۴۰۴/۰۱/۱۵', '1404/01/15'),
+    ('١٤٠٤/٠١/١٥', '1404/01/15'),
+    ('۱۴۰۴/٠١/15', '1404/01/15'),
+    ('۰۱۲۳۴۵۶۷۸۹', digits),
+    ('٠١٢٣٤٥٦٧٨٩', digits),
+    ('ساعت ۱۲:۳۰', 'ساعت 12:30'),
+))
+def test_normalize_persian_digits(text, expected):
+    assert normalize_persian_digits(text) == expected
+
+
+@pytest.mark.parametrize(('text', 'expected'), (
+    ('', ''),
+    (None, None),
+    ('1404/01/15', '۱۴۰۴/۰۱/۱۵'),
+    (1404, '۱۴۰۴'),
+    (digits, '۰۱۲۳۴۵۶۷۸۹'),
+    ('12:30', '۱۲:۳۰'),
+))
+def test_to_persian_digits(text, expected):
+    assert to_persian_digits(text) == expected
+
+
+def test_greg_to_jalali_ymd_matches_jdatetime():
+    from indico.util.jalaali import _greg_to_jalali_ymd
+    # Check the integer-arithmetic conversion against jdatetime across
+    # several Jalali leap-year boundaries
+    d = date(1995, 1, 1)
+    while d < date(2035, 1, 1):
+        jdt = to_jalaali(d)
+        assert _greg_to_jalali_ymd(d.year, d.month, d.day) == (jdt.year, jdt.month, jdt.day)
+        d += timedelta(days=17)
+
+
+def test_persian_weekdays_aligned_with_jdatetime():
+    # PERSIAN_WEEKDAYS must be indexable by jdatetime's weekday(), which
+    # counts from Saturday; 2025-03-22 is a Saturday.
+    expected = ['شنبه', 'یکشنبه', 'دوشنبه', 'سه‌شنبه', 'چهارشنبه', 'پنج‌شنبه', 'جمعه']
+    for offset, name in enumerate(expected):
+        jdt = to_jalaali(date(2025, 3, 22 + offset))
+        assert PERSIAN_WEEKDAYS[jdt.weekday()] == name
+
+
+@pytest.mark.parametrize(('format', 'expected'), (
+    ('short', '04/01/01'),
+    ('medium', '1404/01/01'),
+    ('long', '1 فروردین 1404'),
+    ('full', 'جمعه، 1 فروردین 1404'),
+    ('code', '01/01/1404'),
+    ('%Y-%m-%d', '1404-01-01'),
+))
+def test_format_jalaali_date(format, expected):
+    assert format_jalaali_date(date(2025, 3, 21), format) == expected
+    assert format_jalaali_date(None, format) == ''
+
+
+@pytest.mark.parametrize(('format', 'expected'), (
+    ('short', '04/01/01 14:30'),
+    ('medium', '1404/01/01 14:30'),
+    ('long', '1 فروردین 1404، 14:30'),
+    ('full', 'جمعه، 1 فروردین 1404، 14:30:45'),
+    ('code', '01/01/1404 14:30'),
+    ('%Y-%m-%d %H:%M', '1404-01-01 14:30'),
+))
+def test_format_jalaali_datetime(format, expected):
+    assert format_jalaali_datetime(datetime(2025, 3, 21, 14, 30, 45), format) == expected
+    assert format_jalaali_datetime(None, format) == ''
+
+
+@pytest.mark.parametrize('format', ('medium', 'long', 'full'))
+def test_format_jalaali_dates(format):
+    dates = [date(2025, 3, 21), None, date(2025, 3, 22)]
+    assert format_jalaali_dates(dates, format) == [format_jalaali_date(d, format) if d else '' for d in dates]
+
+
+def test_format_jalaali_datetime_timezone():
+    dt = pytz.utc.localize(datetime(2025, 3, 21, 14, 30))
+    # Iran is at UTC+3:30; the formatted time must be local wall-clock time
+    assert format_jalaali_datetime(dt, 'medium', timezone='Asia/Tehran') == '1404/01/01 18:00'
+
+
+@pytest.mark.parametrize(('date_str', 'format', 'expected'), (
+    ('1404/01/01', '%Y/%m/%d', date(2025, 3, 21)),
+    ('۱۴۰۴/۰۱/۰۱', '%Y/%m/%d', date(2025, 3, 21)),
+    ('1404-01-01', '%Y-%m-%d', date(2025, 3, 21)),
+    ('1404/13/01', '%Y/%m/%d', None),
+    ('garbage', '%Y/%m/%d', None),
+    ('', '%Y/%m/%d', None),
+))
+def test_parse_jalaali_date(date_str, format, expected):
+    assert parse_jalaali_date(date_str, format) == expected
+
+
+@pytest.mark.parametrize(('datetime_str', 'format', 'expected'), (
+    ('1404/01/01 14:30', '%Y/%m/%d %H:%M', datetime(2025, 3, 21, 14, 30)),
+    ('۱۴۰۴/۰۱/۰۱ ۱۴:۳۰', '%Y/%m/%d %H:%M', datetime(2025, 3, 21, 14, 30)),
+    ('1404-01-01 14:30', '%Y-%m-%d %H:%M', datetime(2025, 3, 21, 14, 30)),
+    ('1404/01/01 25:00', '%Y/%m/%d %H:%M', None),
+    ('1404/01/01', '%Y/%m/%d %H:%M', None),
+    ('', '%Y/%m/%d %H:%M', None),
+))
+def test_parse_jalaali_datetime(datetime_str, format, expected):
+    assert parse_jalaali_datetime(datetime_str, format) == expected